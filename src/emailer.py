@@ -1,51 +1,213 @@
 from __future__ import annotations
 
+import atexit
 import logging
 import os
 import smtplib
 import ssl
+import threading
 from email.message import EmailMessage
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 SMTP_ENV_VARS = ("SMTP_HOST", "SMTP_PORT", "SMTP_USER", "SMTP_PASS", "SMTP_FROM")
+MAX_MESSAGES_PER_CONNECTION = 1000
+
+BATCH_ABORT_MIN_SIZE = 30
+
+_SESSION: Optional["SmtpSession"] = None
+_SESSION_LOCK = threading.Lock()
+
+
+class EmailBatchError(RuntimeError):
+    """Raised when too many messages of a batch failed for the rest to be worth sending."""
+
+    def __init__(self, failures: List[Tuple[Tuple[str, str, str], Exception]], total: int) -> None:
+        super().__init__(f"Aborted email batch after {len(failures)} of {total} messages failed")
+        self.failures = failures
+        self.total = total
+
+
+class SmtpSession:
+    """Authenticated SMTP connection kept open and reused across messages."""
+
+    def __init__(self, settings: Dict[str, Any], smtp_conf: Dict[str, Any]) -> None:
+        self.settings = settings
+        self.timeout = float(smtp_conf.get("timeout", 30))
+        self.use_ssl = bool(smtp_conf.get("use_ssl", False))
+        self.use_starttls = bool(smtp_conf.get("use_starttls", not self.use_ssl))
+        self.max_messages = _max_messages_per_connection(smtp_conf)
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._sent = 0
+
+    @property
+    def key(self) -> Tuple[Any, ...]:
+        settings = self.settings
+        return (
+            settings["host"],
+            settings["port"],
+            settings["username"],
+            settings["password"],
+            self.timeout,
+            self.use_ssl,
+            self.use_starttls,
+            self.max_messages,
+        )
+
+    def send(self, message: EmailMessage) -> None:
+        """Send ``message``, reconnecting once if the connection turns out to be dead."""
+        if self._smtp is None or self._sent >= self.max_messages or not self._is_alive():
+            self._reconnect()
+        try:
+            self._smtp.send_message(message)
+        except OSError as exc:
+            if not _is_connection_error(exc):
+                raise
+            logger.warning("SMTP send failed (%s); reconnecting and retrying once.", exc)
+            self._reconnect()
+            self._smtp.send_message(message)
+        self._sent += 1
+
+    def close(self) -> None:
+        smtp, self._smtp = self._smtp, None
+        if smtp is None:
+            return
+        try:
+            smtp.quit()
+        except Exception:  # pragma: no cover - best effort on an already broken socket
+            pass
+
+    def _reconnect(self) -> None:
+        self.close()
+        self._smtp = self._connect()
+        self._sent = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        settings = self.settings
+        context = ssl.create_default_context()
+        if self.use_ssl:
+            smtp: smtplib.SMTP = smtplib.SMTP_SSL(
+                settings["host"], settings["port"], timeout=self.timeout, context=context
+            )
+        else:
+            smtp = smtplib.SMTP(settings["host"], settings["port"], timeout=self.timeout)
+        try:
+            if not self.use_ssl and self.use_starttls:
+                smtp.starttls(context=context)
+            if settings["username"] and settings["password"]:
+                smtp.login(settings["username"], settings["password"])
+        except Exception:
+            try:
+                smtp.close()
+            except Exception:  # pragma: no cover - best effort cleanup
+                pass
+            raise
+        return smtp
+
+    def _is_alive(self) -> bool:
+        # Only probe connections that already carried a message; a fresh one
+        # was just authenticated.
+        if self._sent == 0:
+            return True
+        try:
+            return self._smtp.noop()[0] == 250
+        except Exception:
+            return False
 
 
 def send_email(smtp_conf: Dict[str, Any], to_addr: str, subject: str, body: str) -> None:
     """Send a plaintext email via SMTP using credentials from environment variables."""
     settings = _load_smtp_settings()
-    message = EmailMessage()
-    message["Subject"] = subject
-    message["From"] = settings["from_addr"]
-    message["To"] = to_addr
-    message.set_content(body, subtype="plain", charset="utf-8")
-
-    timeout = float(smtp_conf.get("timeout", 30))
-    use_ssl = bool(smtp_conf.get("use_ssl", False))
-    use_starttls = bool(smtp_conf.get("use_starttls", not use_ssl))
-
     try:
-        if use_ssl:
-            context = ssl.create_default_context()
-            with smtplib.SMTP_SSL(
-                settings["host"], settings["port"], timeout=timeout, context=context
-            ) as smtp:
-                _auth_and_send(smtp, settings, message)
-        else:
-            with smtplib.SMTP(settings["host"], settings["port"], timeout=timeout) as smtp:
-                if use_starttls:
-                    context = ssl.create_default_context()
-                    smtp.starttls(context=context)
-                _auth_and_send(smtp, settings, message)
-    except Exception as exc:  # pragma: no cover - smtplib errors depend on environment
+        with _SESSION_LOCK:
+            _get_session(settings, smtp_conf).send(_build_message(settings, to_addr, subject, body))
+    except Exception as exc:
         logger.error("Failed to send email via SMTP: %s", exc)
+        close_session()
         raise SystemExit(1) from exc
 
 
-def _auth_and_send(smtp: smtplib.SMTP, settings: Dict[str, Any], message: EmailMessage) -> None:
-    if settings["username"] and settings["password"]:
-        smtp.login(settings["username"], settings["password"])
-    smtp.send_message(message)
+def send_many(
+    smtp_conf: Dict[str, Any], messages: Iterable[Tuple[str, str, str]]
+) -> List[Tuple[Tuple[str, str, str], Exception]]:
+    """Send ``(to_addr, subject, body)`` emails over one reused SMTP connection.
+
+    Isolated failures are logged and returned as ``(message, error)`` pairs.
+    For batches of ``BATCH_ABORT_MIN_SIZE`` or more, sending stops with
+    ``EmailBatchError`` once a third of the batch has failed.
+    """
+    batch = list(messages)
+    settings = _load_smtp_settings()
+    failures: List[Tuple[Tuple[str, str, str], Exception]] = []
+
+    with _SESSION_LOCK:
+        session = _get_session(settings, smtp_conf)
+        for item in batch:
+            to_addr, subject, body = item
+            try:
+                session.send(_build_message(settings, to_addr, subject, body))
+            except Exception as exc:
+                logger.warning("Failed to send email to %s: %s", to_addr, exc)
+                # A refused recipient or rejected message leaves the connection
+                # usable (smtplib resets the transaction); anything else may not.
+                if not isinstance(exc, smtplib.SMTPException) or _is_connection_error(exc):
+                    session.close()
+                failures.append((item, exc))
+                if len(batch) >= BATCH_ABORT_MIN_SIZE and len(failures) * 3 >= len(batch):
+                    raise EmailBatchError(failures, len(batch))
+    return failures
+
+
+def close_session() -> None:
+    """Close the shared SMTP connection, if any. Registered to run at exit."""
+    global _SESSION
+    session, _SESSION = _SESSION, None
+    if session is not None:
+        session.close()
+
+
+atexit.register(close_session)
+
+
+def _get_session(settings: Dict[str, Any], smtp_conf: Dict[str, Any]) -> SmtpSession:
+    global _SESSION
+    candidate = SmtpSession(settings, smtp_conf)
+    if _SESSION is None or _SESSION.key != candidate.key:
+        close_session()
+        _SESSION = candidate
+    return _SESSION
+
+
+def _max_messages_per_connection(smtp_conf: Dict[str, Any]) -> int:
+    raw = smtp_conf.get("max_messages_per_connection", MAX_MESSAGES_PER_CONNECTION)
+    if isinstance(raw, str) and raw.strip().isdigit():
+        value = int(raw)
+    elif isinstance(raw, int) and not isinstance(raw, bool):
+        value = raw
+    else:
+        value = 0
+    if value < 1:
+        message = f"max_messages_per_connection must be a positive integer, got {raw!r}"
+        logger.error(message)
+        raise SystemExit(message)
+    return value
+
+
+def _is_connection_error(exc: BaseException) -> bool:
+    # SMTPException subclasses OSError, but its reply errors (refused
+    # recipients, 5xx data errors) would fail again on a fresh connection.
+    if isinstance(exc, smtplib.SMTPException):
+        return isinstance(exc, smtplib.SMTPServerDisconnected)
+    return isinstance(exc, OSError)
+
+
+def _build_message(settings: Dict[str, Any], to_addr: str, subject: str, body: str) -> EmailMessage:
+    message = EmailMessage()
+    message["Subject"] = subject
+    message["From"] = settings["from_addr"]
+    message["To"] = to_addr
+    message.set_content(body, subtype="plain", charset="utf-8")
+    return message
 
 
 def _load_smtp_settings() -> Dict[str, Any]:
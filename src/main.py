@@ -7,14 +7,20 @@ import time
 from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Mapping
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Tuple
 
 import yaml
 from dotenv import load_dotenv
 
+try:  # libyaml-backed loader when PyYAML was built with it
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeLoader
+
 from src.emailer import send_email
 from src.polymarket import (
-    fetch_trades,
+    dedupe_trades,
+    fetch_trades_many,
     format_trades_for_email,
     get_api_call_count,
     reset_api_call_count,
@@ -41,25 +47,37 @@ def main() -> int:
         return 0
 
     since_epoch = _compute_since_epoch(window_minutes)
-    filters = config.get("filters") or {}
+    min_size, sides = _parse_filters(config.get("filters") or {})
 
     reset_api_call_count()
-    trades_by_address: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
-    total_before_filters = 0
+    trades_by_address: "OrderedDict[str, List[Mapping[str, Any]]]" = OrderedDict()
     total_after_filters = 0
 
-    for address in addresses:
-        trades = fetch_trades(address, since_epoch)
-        total_before_filters += len(trades)
-        filtered = _apply_filters(trades, filters)
+    # Filters are applied while parsing the API records, before normalisation.
+    fetched = fetch_trades_many(
+        addresses,
+        since_epoch,
+        min_size=min_size,
+        sides=sides,
+        hedge=_env_flag("POLYMARKET_HEDGE"),
+        return_exceptions=True,
+    )
+    failed_addresses: List[str] = []
+    for address, trades in fetched.items():
+        if isinstance(trades, Exception):
+            # Still notify about the other addresses; the run exits non-zero below.
+            logger.error("Failed to fetch trades for %s: %s", address, trades)
+            failed_addresses.append(address)
+            continue
+        filtered = dedupe_trades(trades)
         total_after_filters += len(filtered)
         trades_by_address[address] = filtered
 
+    exit_code = 1 if failed_addresses else 0
     duration = time.perf_counter() - start_time
     logger.info(
-        "API calls=%s total_trades=%s filtered_trades=%s window=%s min duration=%.2fs",
+        "API calls=%s filtered_trades=%s window=%s min duration=%.2fs",
         get_api_call_count(),
-        total_before_filters,
         total_after_filters,
         window_minutes,
         duration,
@@ -67,7 +85,7 @@ def main() -> int:
 
     if total_after_filters == 0:
         logger.info("No new trades found; skipping email notification.")
-        return 0
+        return exit_code
 
     email_cfg = config.get("email") or {}
     recipient = email_cfg.get("to")
@@ -79,7 +97,7 @@ def main() -> int:
 
     send_email(config.get("smtp", {}), recipient, subject, body)
     logger.info("Notification sent to %s", recipient)
-    return 0
+    return exit_code
 
 
 def _configure_logging() -> None:
@@ -90,11 +108,15 @@ def _configure_logging() -> None:
     )
 
 
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
 def _load_config(path: Path) -> Dict[str, Any]:
     if not path.exists():
         raise SystemExit(f"Missing config file at {path}")
     with path.open("r", encoding="utf-8") as handle:
-        data = yaml.safe_load(handle) or {}
+        data = yaml.load(handle, Loader=SafeLoader) or {}
     if not isinstance(data, dict):
         raise SystemExit("config.yaml must contain a mapping at the root")
     return data
@@ -106,22 +128,11 @@ def _compute_since_epoch(window_minutes: int) -> int:
     return int((now - delta).timestamp())
 
 
-def _apply_filters(trades: Iterable[Mapping[str, Any]], filters: Mapping[str, Any]) -> List[Dict[str, Any]]:
-    min_size = filters.get("min_size")
-    min_size_value = _coerce_float(min_size)
+def _parse_filters(filters: Mapping[str, Any]) -> Tuple[Optional[float], FrozenSet[str]]:
+    min_size_value = _coerce_float(filters.get("min_size"))
     sides = filters.get("sides") or []
-    allowed_sides = {str(side).upper() for side in sides if side}
-
-    filtered: List[Dict[str, Any]] = []
-    for trade in trades:
-        size = trade.get("size")
-        side = (trade.get("side") or "").upper()
-        if min_size_value is not None and (size is None or size < min_size_value):
-            continue
-        if allowed_sides and side not in allowed_sides:
-            continue
-        filtered.append(dict(trade))
-    return filtered
+    allowed_sides = frozenset(str(side).upper() for side in sides if side)
+    return min_size_value, allowed_sides
 
 
 def _coerce_float(value: Any) -> Any:
@@ -1,22 +1,111 @@
 from __future__ import annotations
 
+import io
 import logging
+import os
+import threading
 import time
-from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional, Sequence
-
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Callable, Collection, Dict, Iterable, List, Mapping, MutableMapping, Optional, Sequence, Tuple, Union
+
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 BASE_URL = "https://data-api.polymarket.com"
 TRADES_ENDPOINT = "/trades"
 ACTIVITY_ENDPOINT = "/activity"
 TRADE_LIMIT = 1000
+HTTP_CONNECT_TIMEOUT = 3.05
 HTTP_TIMEOUT = 10
-MAX_RETRIES = 1
-BACKOFF_SECONDS = 2
+RETRY_ATTEMPTS = 2
+RETRY_DELAY_MS = 250
+RETRY_MAX_DELAY_MS = 2000
+HEDGE_DELAY_MS = 400
+RESPONSE_CACHE_TTL_SECONDS = 15
+CACHE_MAX_ENTRIES = 256
+SOFT_FALLBACK_WINDOW_SECONDS = 3600
+HTTP_POOL_SIZE = 32
+MAX_FETCH_WORKERS = 16
+SEEN_TRADES_CAPACITY = 50_000
+
+EMAIL_SEPARATOR = "=" * 80
+TRADE_SEPARATOR = "-" * 40
+_ADDRESS_HEADER_TEMPLATE = f"{EMAIL_SEPARATOR}\n🔍 TRADES PAR %s\n{EMAIL_SEPARATOR}\n\n"
+_TRADE_TEMPLATE = (
+    "⏰ %(time)s\n"
+    "%(emoji)s Action: %(side)s\n"
+    "🎯 Parts: %(shares)s\n"
+    "💰 Montant Total: %(size)s USDC\n"
+    "💵 Prix par part: %(price)s USDC\n"
+    "🎲 Marché: %(title)s\n"
+    "\n"
+    f"{TRADE_SEPARATOR}\n"
+    "\n"
+)
 
 logger = logging.getLogger(__name__)
 _API_CALL_COUNT = 0
+_API_CALL_LOCK = threading.Lock()
+_URL_BY_ENDPOINT = {
+    TRADES_ENDPOINT: f"{BASE_URL}{TRADES_ENDPOINT}",
+    ACTIVITY_ENDPOINT: f"{BASE_URL}{ACTIVITY_ENDPOINT}",
+}
+_EMPTY_MAPPING: Mapping[str, Any] = {}
+_BY_TIMESTAMP = itemgetter("timestamp")
+# Spellings the API actually sends, mapped without allocating a new string.
+_SIDE_NORM = {"BUY": "BUY", "SELL": "SELL", "buy": "BUY", "sell": "SELL", "Buy": "BUY", "Sell": "SELL"}
+# (endpoint, params) -> (monotonic expiry, payload): coalesces identical calls
+# made within RESPONSE_CACHE_TTL_SECONDS of each other.
+_RESPONSE_CACHE: "OrderedDict[Tuple[str, Tuple[Tuple[str, Any], ...]], Tuple[float, Any]]" = OrderedDict()
+_RESPONSE_CACHE_LOCK = threading.Lock()
+# Per-thread marker set while running a hedged request; see _cache_writes_allowed.
+_HEDGE_STATE = threading.local()
+# (endpoint, params) -> (ETag, Last-Modified, payload) of the last 200 response,
+# so repeat polls of an unchanged query can be answered with a bodiless 304.
+# The payload is kept because a 304 only says the page is unchanged: callers
+# still filter it against their own since_epoch and filters.
+_VALIDATOR_CACHE: "OrderedDict[Tuple[str, Tuple[Tuple[str, Any], ...]], Tuple[Optional[str], Optional[str], Any]]" = (
+    OrderedDict()
+)
+
+# One pooled session for every call so keep-alive connections (and their TLS
+# handshakes) are reused across addresses, retries and polls.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=0),
+)
+_SESSION.headers.update({"Accept": "application/json", "Accept-Encoding": "gzip, deflate"})
+
+
+class _LRUSet:
+    """Set of recently seen keys that evicts the oldest once it exceeds ``capacity``."""
+
+    __slots__ = ("_keys", "_capacity")
+
+    def __init__(self, capacity: int) -> None:
+        self._keys: "OrderedDict[Any, None]" = OrderedDict()
+        self._capacity = capacity
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: Any) -> None:
+        self._keys[key] = None
+        self._keys.move_to_end(key)
+        if len(self._keys) > self._capacity:
+            self._keys.popitem(last=False)
+
+
+_SEEN_TRADES = _LRUSet(SEEN_TRADES_CAPACITY)
 
 
 class PolymarketError(RuntimeError):
@@ -32,131 +121,410 @@ def get_api_call_count() -> int:
     return _API_CALL_COUNT
 
 
+def clear_response_cache() -> None:
+    """Forget cached API responses and conditional-request validators. Useful for tests."""
+    with _RESPONSE_CACHE_LOCK:
+        _RESPONSE_CACHE.clear()
+        _VALIDATOR_CACHE.clear()
+
+
 def reset_api_call_count() -> None:
     """Reset the API call counter. Useful for tests."""
     global _API_CALL_COUNT
-    _API_CALL_COUNT = 0
-
-
-def fetch_trades(address: str, since_epoch: int) -> List[Dict[str, Any]]:
-    """Fetch recent trades for an address, falling back to /activity if needed."""
-    if not address:
+    with _API_CALL_LOCK:
+        _API_CALL_COUNT = 0
+
+
+def fetch_trades(
+    address: str,
+    since_epoch: int,
+    min_size: Optional[float] = None,
+    sides: Optional[Collection[str]] = None,
+    hedge: bool = False,
+) -> List[Dict[str, Any]]:
+    """Fetch recent trades for an address, falling back to /activity if needed.
+
+    ``min_size`` and ``sides`` (upper-case) are checked on the raw records, so
+    trades they reject are never normalised. With ``hedge``, /activity is also
+    queried if /trades has not answered within ``HEDGE_DELAY_MS`` and the first
+    successful response wins.
+    """
+    if not address or since_epoch >= time.time():
+        # Nothing can be newer than "now": skip the round-trip entirely.
         return []
 
     params = {"user": address, "limit": TRADE_LIMIT}
-    try:
-        payload = _request_json(TRADES_ENDPOINT, params)
-        records = _extract_records(payload, ("data", "trades", "records"))
-    except PolymarketServerError as exc:
+    # /activity can filter by time server-side; /trades cannot, so the
+    # since_epoch check below stays for both.
+    activity_params = {**params, "start": since_epoch}
+    if hedge:
+        records, from_trades = _fetch_records_hedged(address, params, activity_params)
+    else:
+        try:
+            records, from_trades = _fetch_trade_records(params), True
+        except PolymarketServerError as exc:
+            logger.warning(
+                "Primary /trades endpoint failed for %s (%s). Falling back to /activity.",
+                address,
+                exc,
+            )
+            records, from_trades = _fetch_activity_records(activity_params), False
+    if from_trades and not records and _empty_page_fallback_enabled(since_epoch):
         logger.warning(
-            "Primary /trades endpoint failed for %s (%s). Falling back to /activity.",
+            "Primary /trades endpoint returned no records for %s. Checking /activity.",
             address,
-            exc,
         )
-        payload = _request_json(ACTIVITY_ENDPOINT, params)
-        records = _extract_records(payload, ("data", "activity", "activities", "results"))
+        records = _fetch_activity_records(activity_params)
 
     normalized: List[Dict[str, Any]] = []
+    # Bound once: this loop runs over up to TRADE_LIMIT records per address.
+    append = normalized.append
+    coerce_timestamp = _coerce_timestamp
+    normalize = _normalize_trade
+    to_float = _to_float
+    side_norm = _SIDE_NORM
     for raw_trade in records:
-        timestamp = _coerce_timestamp(raw_trade)
+        timestamp = coerce_timestamp(raw_trade)
         if timestamp is None or timestamp <= since_epoch:
             continue
-        normalized_trade = _normalize_trade(raw_trade, address, timestamp)
-        normalized.append(normalized_trade)
+        if min_size is not None:
+            size = to_float(raw_trade.get("size"), raw_trade.get("amount"), raw_trade.get("quantity"))
+            if size is None or size < min_size:
+                continue
+        if sides:
+            side = raw_trade.get("side")
+            if (side_norm.get(side) or (side or "").upper()) not in sides:
+                continue
+        append(normalize(raw_trade, address, timestamp))
+    # API pages are already newest-first, so this is a linear pass in practice.
+    normalized.sort(key=_BY_TIMESTAMP, reverse=True)
     return normalized
 
 
+def fetch_trades_many(
+    addresses: Sequence[str],
+    since_epoch: int,
+    min_size: Optional[float] = None,
+    sides: Optional[Collection[str]] = None,
+    hedge: bool = False,
+    return_exceptions: bool = False,
+) -> Dict[str, Union[List[Dict[str, Any]], Exception]]:
+    """Fetch trades for several addresses in one concurrent batch, keyed by address in input order.
+
+    With ``return_exceptions``, an address whose fetch failed maps to the
+    exception instead of aborting the whole batch.
+    """
+    if not addresses:
+        return {}
+
+    # Each address is an independent, network-bound call: submit them all at
+    # once so a slow or retrying address does not hold up the others.
+    with ThreadPoolExecutor(max_workers=min(len(addresses), MAX_FETCH_WORKERS)) as executor:
+        futures = [
+            executor.submit(fetch_trades, address, since_epoch, min_size, sides, hedge)
+            for address in addresses
+        ]
+        results: Dict[str, Union[List[Dict[str, Any]], Exception]] = {}
+        for address, future in zip(addresses, futures):
+            error = future.exception()
+            if error is None:
+                results[address] = future.result()
+            elif return_exceptions and isinstance(error, Exception):
+                results[address] = error
+            else:
+                raise error
+        return results
+
+
+def dedupe_trades(
+    trades: Iterable[Mapping[str, Any]], seen: Optional[_LRUSet] = None
+) -> List[Mapping[str, Any]]:
+    """Drop trades already reported by this process (or repeated within ``trades``)."""
+    if seen is None:
+        seen = _SEEN_TRADES
+    unique: List[Mapping[str, Any]] = []
+    for trade in trades:
+        key = _trade_key(trade)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(trade)
+    return unique
+
+
 def format_trades_for_email(trades_by_address: Mapping[str, Sequence[Mapping[str, Any]]]) -> str:
     """Return a plain-text email body summarising trades per address in a clear, visual format."""
-    blocks: List[str] = []
-    
+    buffer = io.StringIO()
+    write = buffer.write
+
     for address, trades in trades_by_address.items():
         if not trades:
             continue
-        
-        sorted_trades = sorted(trades, key=lambda item: item.get("timestamp", 0), reverse=True)
-        blocks.append("=" * 80)  # Visual separator
-        blocks.append(f"🔍 TRADES PAR {address}")
-        blocks.append("=" * 80)
-        blocks.append("")  # Empty line for readability
-        
+
+        timestamps = [trade.get("timestamp", 0) for trade in trades]
+        if all(newer >= older for newer, older in zip(timestamps, timestamps[1:])):
+            sorted_trades = trades  # already newest-first, as fetch_trades returns them
+        else:
+            sorted_trades = sorted(trades, key=lambda item: item.get("timestamp", 0), reverse=True)
+        write(_ADDRESS_HEADER_TEMPLATE % address)
+
         for trade in sorted_trades:
             # Format timestamp in a more readable way
             timestamp = trade.get("timestamp")
-            if timestamp:
-                dt = datetime.fromtimestamp(float(timestamp), tz=timezone.utc).astimezone()
-                time_str = dt.strftime("%d/%m/%Y %H:%M:%S")
-            else:
-                time_str = "Heure inconnue"
-            
+            time_str = _format_local_time(timestamp) if timestamp else "Heure inconnue"
+
             # Get trade details
             side = str(trade.get("side", "") or "").upper()
-            side_emoji = "🟢" if side == "BUY" else "🔴" if side == "SELL" else "⚪"
-            size = _format_decimal(trade.get("size"))
-            price = _format_decimal(trade.get("price"))
-            title = trade.get("title") or trade.get("marketSlug") or trade.get("eventSlug") or "Marché inconnu"
-            
-            # Calculate number of shares (size/price)
-            try:
-                shares = float(size) / float(price) if size and price and float(price) != 0 else None
-                shares_str = f"{shares:,.0f}" if shares is not None else "N/A"
-            except (TypeError, ValueError):
-                shares_str = "N/A"
-
-            # Format block in a clear, visual way
-            trade_block = [
-                f"⏰ {time_str}",
-                f"{side_emoji} Action: {side}",
-                f"🎯 Parts: {shares_str}",
-                f"💰 Montant Total: {size} USDC",
-                f"💵 Prix par part: {price} USDC",
-                f"🎲 Marché: {title}",
-                ""  # Empty line between trades
-            ]
-            blocks.extend(trade_block)
-            blocks.append("-" * 40)  # Visual separator between trades
-            blocks.append("")  # Empty line for readability
-            
-    return "\n".join(blocks)
+            raw_size = trade.get("size")
+            raw_price = trade.get("price")
+            size = _format_decimal(raw_size)
+            price = _format_decimal(raw_price)
+
+            # Calculate number of shares (size/price) from the raw values; the
+            # formatted strings carry thousands separators and rounding.
+            if isinstance(raw_size, (int, float)) and isinstance(raw_price, (int, float)):
+                shares_str = f"{raw_size / raw_price:,.0f}" if raw_price else "N/A"
+            else:
+                try:
+                    shares_str = f"{float(raw_size) / float(raw_price):,.0f}"
+                except (TypeError, ValueError, ZeroDivisionError):
+                    shares_str = "N/A"
+
+            write(
+                _TRADE_TEMPLATE
+                % {
+                    "time": time_str,
+                    "emoji": "🟢" if side == "BUY" else "🔴" if side == "SELL" else "⚪",
+                    "side": side,
+                    "shares": shares_str,
+                    "size": size,
+                    "price": price,
+                    "title": trade.get("title")
+                    or trade.get("marketSlug")
+                    or trade.get("eventSlug")
+                    or "Marché inconnu",
+                }
+            )
+
+    # Every line is newline-terminated; drop the final one to keep the body's
+    # historical shape (no trailing newline after the last blank line).
+    return buffer.getvalue()[:-1]
+
+
+def _fetch_trade_records(params: Mapping[str, Any]) -> Sequence[MutableMapping[str, Any]]:
+    payload = _request_with_retry(TRADES_ENDPOINT, params)
+    return _extract_records(payload, ("data", "trades", "records"))
+
+
+def _fetch_activity_records(params: Mapping[str, Any]) -> Sequence[MutableMapping[str, Any]]:
+    payload = _request_with_retry(ACTIVITY_ENDPOINT, params)
+    return _extract_records(payload, ("data", "activity", "activities", "results"))
+
+
+def _fetch_records_hedged(
+    address: str, params: Mapping[str, Any], activity_params: Mapping[str, Any]
+) -> Tuple[Sequence[MutableMapping[str, Any]], bool]:
+    # Both endpoints are idempotent reads, so a slow /trades call is raced
+    # against /activity instead of waiting for its timeout and retries.
+    # Returns the winning records and whether they came from /trades.
+    abandoned = threading.Event()
+    primary = _start_hedge_request(_fetch_trade_records, params, abandoned)
+    try:
+        done, _ = wait([primary], timeout=HEDGE_DELAY_MS / 1000.0)
+        if done:
+            error = primary.exception()
+            if error is None:
+                return primary.result(), True
+            # Same rule as the sequential path: only server errors fail over.
+            if not isinstance(error, PolymarketServerError):
+                raise error
+            logger.warning(
+                "Primary /trades endpoint failed for %s (%s). Falling back to /activity.",
+                address,
+                error,
+            )
+            pending = {_start_hedge_request(_fetch_activity_records, activity_params, abandoned)}
+        else:
+            pending = {primary, _start_hedge_request(_fetch_activity_records, activity_params, abandoned)}
+
+        last_error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    return future.result(), future is primary
+                if future is primary and not isinstance(error, PolymarketServerError):
+                    raise error
+                last_error = error
+        raise last_error  # type: ignore[misc]
+    finally:
+        # The losing request keeps running; stop it from writing its result
+        # into the shared caches once this call has returned.
+        with _RESPONSE_CACHE_LOCK:
+            abandoned.set()
+
+
+def _start_hedge_request(
+    fetch: Callable[[Mapping[str, Any]], Sequence[MutableMapping[str, Any]]],
+    params: Mapping[str, Any],
+    abandoned: threading.Event,
+) -> "Future[Sequence[MutableMapping[str, Any]]]":
+    # A daemon thread rather than an executor: concurrent.futures joins its
+    # workers at interpreter exit, so a losing request would hold up a cron
+    # run for its full timeout and retries.
+    future: "Future[Sequence[MutableMapping[str, Any]]]" = Future()
+
+    def run() -> None:
+        _HEDGE_STATE.abandoned = abandoned
+        try:
+            future.set_result(fetch(params))
+        except BaseException as exc:  # handed to the waiting caller
+            future.set_exception(exc)
+        finally:
+            _HEDGE_STATE.abandoned = None
+
+    threading.Thread(target=run, name="polymarket-hedge", daemon=True).start()
+    return future
+
+
+def _cache_writes_allowed() -> bool:
+    # Call with _RESPONSE_CACHE_LOCK held, so the check and the write cannot
+    # straddle the moment a hedged call gives up on this request.
+    abandoned = getattr(_HEDGE_STATE, "abandoned", None)
+    return abandoned is None or not abandoned.is_set()
+
+
+def _empty_page_fallback_enabled(since_epoch: int) -> bool:
+    # An empty /trades page over a long window is more likely an upstream
+    # glitch than a quiet wallet; only worth a second call when opted in.
+    if os.getenv("POLYMARKET_EMPTY_FALLBACK", "").strip().lower() not in ("1", "true", "yes", "on"):
+        return False
+    return since_epoch < time.time() - SOFT_FALLBACK_WINDOW_SECONDS
+
+
+def _request_with_retry(
+    endpoint: str,
+    params: Mapping[str, Any],
+    attempts: Optional[int] = None,
+    base_delay_ms: Optional[int] = None,
+) -> Any:
+    """Call ``_request_json`` up to ``attempts`` times, backing off exponentially on server errors.
+
+    Successful payloads are cached for ``RESPONSE_CACHE_TTL_SECONDS``.
+    """
+    cache_key = (endpoint, tuple(sorted(params.items())))
+    now = time.monotonic()
+    with _RESPONSE_CACHE_LOCK:
+        cached = _RESPONSE_CACHE.get(cache_key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    if attempts is None:
+        attempts = _env_int("POLYMARKET_RETRY_ATTEMPTS", RETRY_ATTEMPTS)
+    if base_delay_ms is None:
+        base_delay_ms = _env_int("POLYMARKET_RETRY_DELAY_MS", RETRY_DELAY_MS)
+    attempts = max(attempts, 1)
+
+    for attempt in range(attempts):
+        try:
+            payload = _request_json(endpoint, params)
+        except PolymarketServerError:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(min(base_delay_ms * 2**attempt, RETRY_MAX_DELAY_MS) / 1000.0)
+        else:
+            with _RESPONSE_CACHE_LOCK:
+                if _cache_writes_allowed():
+                    _store_response(cache_key, payload)
+            return payload
+
+
+def _store_response(cache_key: Tuple[str, Tuple[Tuple[str, Any], ...]], payload: Any) -> None:
+    # Call with _RESPONSE_CACHE_LOCK held. Every entry gets the same TTL, so
+    # insertion order is expiry order: expired entries sit at the front.
+    now = time.monotonic()
+    _RESPONSE_CACHE[cache_key] = (now + RESPONSE_CACHE_TTL_SECONDS, payload)
+    _RESPONSE_CACHE.move_to_end(cache_key)
+    while _RESPONSE_CACHE:
+        oldest_key, (expires_at, _) = next(iter(_RESPONSE_CACHE.items()))
+        if expires_at > now and len(_RESPONSE_CACHE) <= CACHE_MAX_ENTRIES:
+            break
+        del _RESPONSE_CACHE[oldest_key]
 
 
 def _request_json(endpoint: str, params: Mapping[str, Any]) -> Any:
-    """Call the Polymarket API endpoint and return JSON, handling retries."""
-    url = f"{BASE_URL}{endpoint}"
-    last_error: Optional[Exception] = None
+    """Call the Polymarket API endpoint once and return its JSON payload."""
+    url = _URL_BY_ENDPOINT.get(endpoint) or f"{BASE_URL}{endpoint}"
+    cache_key = (endpoint, tuple(sorted(params.items())))
+    validators = _VALIDATOR_CACHE.get(cache_key)
+    headers = _conditional_headers(validators) if validators else None
 
-    for attempt in range(MAX_RETRIES + 1):
+    try:
+        response = _perform_request(url, params, headers=headers)
+    except requests.RequestException as exc:
+        raise PolymarketServerError(str(exc)) from exc
+
+    if response.status_code == 304 and validators is not None:
+        # Nothing changed since the previous poll of this query.
+        return validators[2]
+    if response.status_code == 200:
         try:
-            response = _perform_request(url, params)
-            if response.status_code == 200:
-                try:
-                    return response.json()
-                except ValueError as exc:
-                    raise PolymarketError(f"Invalid JSON from {endpoint}: {exc}") from exc
-
-            if response.status_code >= 500:
-                last_error = PolymarketServerError(
-                    f"{endpoint} responded with {response.status_code}"
-                )
-            else:
-                response.raise_for_status()
-        except (requests.RequestException, PolymarketServerError) as exc:
-            last_error = exc if isinstance(exc, PolymarketError) else PolymarketServerError(str(exc))
-
-        if attempt < MAX_RETRIES:
-            time.sleep(BACKOFF_SECONDS)
-        else:
-            break
+            payload = orjson.loads(response.content)
+        except orjson.JSONDecodeError as exc:
+            raise PolymarketError(f"Invalid JSON from {endpoint}: {exc}") from exc
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            with _RESPONSE_CACHE_LOCK:
+                if _cache_writes_allowed():
+                    _VALIDATOR_CACHE[cache_key] = (etag, last_modified, payload)
+                    _VALIDATOR_CACHE.move_to_end(cache_key)
+                    if len(_VALIDATOR_CACHE) > CACHE_MAX_ENTRIES:
+                        _VALIDATOR_CACHE.popitem(last=False)
+        return payload
 
-    if isinstance(last_error, PolymarketServerError):
-        raise last_error
-    raise PolymarketError(last_error or f"Unable to reach {endpoint}")
+    if response.status_code >= 500:
+        raise PolymarketServerError(f"{endpoint} responded with {response.status_code}")
+    try:
+        response.raise_for_status()
+    except requests.RequestException as exc:
+        raise PolymarketServerError(str(exc)) from exc
+    raise PolymarketError(f"Unable to reach {endpoint}: unexpected status {response.status_code}")
 
 
-def _perform_request(url: str, params: Mapping[str, Any]) -> requests.Response:
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw in (None, ""):
+        return default
+    try:
+        value = int(raw)
+    except ValueError as exc:
+        raise PolymarketError(f"{name} must be an integer, got {raw}") from exc
+    if value < 0:
+        raise PolymarketError(f"{name} must not be negative, got {raw}")
+    return value
+
+
+def _conditional_headers(validators: Tuple[Optional[str], Optional[str], Any]) -> Dict[str, str]:
+    etag, last_modified, _ = validators
+    headers: Dict[str, str] = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def _perform_request(
+    url: str, params: Mapping[str, Any], headers: Optional[Mapping[str, str]] = None
+) -> requests.Response:
     global _API_CALL_COUNT
-    response = requests.get(url, params=params, timeout=HTTP_TIMEOUT)
-    _API_CALL_COUNT += 1
+    response = _SESSION.get(
+        url, params=params, headers=headers, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_TIMEOUT)
+    )
+    with _API_CALL_LOCK:
+        _API_CALL_COUNT += 1
     return response
 
 
@@ -184,6 +552,8 @@ def _coerce_timestamp(trade: Mapping[str, Any]) -> Optional[int]:
     raw = trade.get("timestamp") or trade.get("created_at") or trade.get("createdAt")
     if raw is None:
         return None
+    if type(raw) is int:  # common case; excludes bool, which float() maps to 0/1 below
+        return raw // 1000 if raw > 1_000_000_000_000 else raw
     try:
         value = float(raw)
     except (TypeError, ValueError):
@@ -196,43 +566,61 @@ def _coerce_timestamp(trade: Mapping[str, Any]) -> Optional[int]:
 def _normalize_trade(trade: Mapping[str, Any], address: str, timestamp: int) -> Dict[str, Any]:
     market = _get_mapping(trade.get("market"))
     event = _get_mapping(trade.get("event"))
-
-    def pick(*keys: str, source: Optional[Mapping[str, Any]] = None) -> Optional[Any]:
-        containers = [trade]
-        if source:
-            containers.insert(0, source)
-        for container in containers:
-            for key in keys:
-                value = container.get(key) if isinstance(container, Mapping) else None
-                if value not in (None, ""):
-                    return value
-        return None
-
-    tx_hash = pick("txHash", "transactionHash", "tx_hash", "id")
-    title = pick("title", "question", "name", source=market) or pick("title", "name", source=event)
-    slug = pick("marketSlug", "slug", source=market)
-    event_slug = pick("eventSlug", "slug", source=event)
-    condition_id = pick("conditionId", source=market)
-    outcome = pick("outcome", "outcomeToken", "token") or trade.get("side")
+    get = trade.get
+
+    # Straight-line lookups, most specific source first; empty values count as
+    # missing and fall through to the next candidate.
+    title = (
+        market.get("title")
+        or market.get("question")
+        or market.get("name")
+        or get("title")
+        or get("question")
+        or get("name")
+        or event.get("title")
+        or event.get("name")
+        or None
+    )
+    side = get("side")
 
     return {
         "address": address,
         "timestamp": timestamp,
         "title": title,
-        "conditionId": condition_id,
-        "outcome": outcome,
-        "side": (trade.get("side") or "").upper() or None,
-        "size": _to_float(trade.get("size"), trade.get("amount"), trade.get("quantity")),
-        "price": _to_float(trade.get("price")),
-        "txHash": tx_hash,
-        "id": trade.get("id"),
-        "marketSlug": slug,
-        "eventSlug": event_slug,
+        "conditionId": market.get("conditionId") or get("conditionId") or None,
+        "outcome": get("outcome") or get("outcomeToken") or get("token") or side,
+        "side": _SIDE_NORM.get(side) or (side or "").upper() or None,
+        "size": _to_float(get("size"), get("amount"), get("quantity")),
+        "price": _to_float(get("price")),
+        "txHash": get("txHash") or get("transactionHash") or get("tx_hash") or get("id") or None,
+        "id": get("id"),
+        "marketSlug": (
+            market.get("marketSlug") or market.get("slug") or get("marketSlug") or get("slug") or None
+        ),
+        "eventSlug": (
+            event.get("eventSlug") or event.get("slug") or get("eventSlug") or get("slug") or None
+        ),
     }
 
 
+def _trade_key(trade: Mapping[str, Any]) -> Tuple[Any, ...]:
+    # One transaction can hold several fills for the same wallet, so the hash
+    # alone is not unique; only identical fills are treated as duplicates.
+    get = trade.get
+    return (
+        get("address"),
+        get("txHash") or get("id"),
+        get("timestamp"),
+        get("title"),
+        get("outcome"),
+        get("side"),
+        get("size"),
+        get("price"),
+    )
+
+
 def _get_mapping(value: Any) -> Mapping[str, Any]:
-    return value if isinstance(value, Mapping) else {}
+    return value if isinstance(value, Mapping) else _EMPTY_MAPPING
 
 
 def _to_float(*values: Any) -> Optional[float]:
@@ -246,18 +634,17 @@ def _to_float(*values: Any) -> Optional[float]:
     return None
 
 
-def _format_timestamp(timestamp: Any) -> str:
+@lru_cache(maxsize=4096)
+def _format_local_time(timestamp: Any) -> str:
+    # Fills from the same transaction share a timestamp; format each one once.
     if not isinstance(timestamp, (int, float)):
-        return "unknown-time"
-    dt = datetime.fromtimestamp(float(timestamp), tz=timezone.utc).astimezone()
-    return dt.isoformat()
+        timestamp = float(timestamp)
+    # Naive local time goes through C localtime(), which applies the DST rule
+    # in force at that timestamp.
+    return datetime.fromtimestamp(timestamp).strftime("%d/%m/%Y %H:%M:%S")
 
 
 def _format_decimal(value: Optional[float]) -> Optional[str]:
     if value is None:
         return None
-    if value >= 100:
-        return f"{value:,.0f}"
-    if value >= 10:
-        return f"{value:,.2f}"
-    return f"{value:,.4f}"
+    return format(value, ",.0f" if value >= 100 else ",.2f" if value >= 10 else ",.4f")
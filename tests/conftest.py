@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+import pytest
+
+from src import polymarket
+
+
+@pytest.fixture(autouse=True)
+def clear_polymarket_response_cache():
+    polymarket.clear_response_cache()
+    yield
+    polymarket.clear_response_cache()
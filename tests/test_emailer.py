@@ -5,17 +5,24 @@ import pytest
 from src import emailer
 
 
-def test_send_email_failure_triggers_system_exit(monkeypatch):
-    env = {
-        "SMTP_HOST": "smtp.example.com",
-        "SMTP_PORT": "587",
-        "SMTP_USER": "user@example.com",
-        "SMTP_PASS": "pass",
-        "SMTP_FROM": "bot@example.com",
-    }
-    for key, value in env.items():
+SMTP_ENV = {
+    "SMTP_HOST": "smtp.example.com",
+    "SMTP_PORT": "587",
+    "SMTP_USER": "user@example.com",
+    "SMTP_PASS": "pass",
+    "SMTP_FROM": "bot@example.com",
+}
+
+
+@pytest.fixture(autouse=True)
+def smtp_env(monkeypatch):
+    for key, value in SMTP_ENV.items():
         monkeypatch.setenv(key, value)
+    yield
+    emailer.close_session()
 
+
+def test_send_email_failure_triggers_system_exit(monkeypatch):
     class BrokenSMTP:
         def __init__(self, *args, **kwargs):
             pass
@@ -39,3 +46,193 @@ def test_send_email_failure_triggers_system_exit(monkeypatch):
 
     with pytest.raises(SystemExit):
         emailer.send_email({}, "dest@example.com", "Subject", "Body")
+
+
+def test_send_email_reuses_one_smtp_connection(monkeypatch):
+    connections = []
+
+    class RecordingSMTP:
+        def __init__(self, *args, **kwargs):
+            self.sent = []
+            connections.append(self)
+
+        def starttls(self, *args, **kwargs):
+            return None
+
+        def login(self, *args, **kwargs):
+            return None
+
+        def noop(self):
+            return (250, b"OK")
+
+        def send_message(self, message):
+            self.sent.append(message["Subject"])
+
+        def quit(self):
+            return None
+
+    monkeypatch.setattr(emailer.smtplib, "SMTP", RecordingSMTP)
+
+    emailer.send_email({}, "dest@example.com", "First", "Body")
+    emailer.send_email({}, "dest@example.com", "Second", "Body")
+
+    assert len(connections) == 1
+    assert connections[0].sent == ["First", "Second"]
+
+
+def _flaky_smtp(connections, failures):
+    class FlakySMTP:
+        def __init__(self, *args, **kwargs):
+            self.sent = []
+            connections.append(self)
+
+        def starttls(self, *args, **kwargs):
+            return None
+
+        def login(self, *args, **kwargs):
+            return None
+
+        def noop(self):
+            return (250, b"OK")
+
+        def send_message(self, message):
+            if failures:
+                raise failures.pop(0)
+            self.sent.append(message["Subject"])
+
+        def quit(self):
+            return None
+
+    return FlakySMTP
+
+
+def _disconnected():
+    return emailer.smtplib.SMTPServerDisconnected("connection dropped")
+
+
+def test_send_email_reconnects_once_after_disconnect(monkeypatch):
+    connections = []
+    monkeypatch.setattr(emailer.smtplib, "SMTP", _flaky_smtp(connections, [_disconnected()]))
+
+    emailer.send_email({}, "dest@example.com", "Subject", "Body")
+
+    assert len(connections) == 2
+    assert connections[0].sent == []
+    assert connections[1].sent == ["Subject"]
+
+
+def test_send_email_exits_when_retry_also_disconnects(monkeypatch):
+    connections = []
+    monkeypatch.setattr(emailer.smtplib, "SMTP", _flaky_smtp(connections, [_disconnected(), _disconnected()]))
+
+    with pytest.raises(SystemExit):
+        emailer.send_email({}, "dest@example.com", "Subject", "Body")
+    assert len(connections) == 2
+
+
+def test_send_email_does_not_reconnect_after_rejected_recipient(monkeypatch):
+    connections = []
+    refused = emailer.smtplib.SMTPRecipientsRefused({"dest@example.com": (550, b"No such user")})
+    monkeypatch.setattr(emailer.smtplib, "SMTP", _flaky_smtp(connections, [refused]))
+
+    with pytest.raises(SystemExit):
+        emailer.send_email({}, "dest@example.com", "Subject", "Body")
+    assert len(connections) == 1
+
+
+def test_send_email_recycles_connection_after_max_messages(monkeypatch):
+    connections = []
+    monkeypatch.setattr(emailer.smtplib, "SMTP", _flaky_smtp(connections, []))
+    smtp_conf = {"max_messages_per_connection": 1}
+
+    emailer.send_email(smtp_conf, "dest@example.com", "First", "Body")
+    emailer.send_email(smtp_conf, "dest@example.com", "Second", "Body")
+
+    assert len(connections) == 2
+    assert [connection.sent for connection in connections] == [["First"], ["Second"]]
+
+
+@pytest.mark.parametrize("value", [0, -1, "ten", 2.5, True])
+def test_send_email_rejects_invalid_max_messages_per_connection(monkeypatch, value):
+    connections = []
+    monkeypatch.setattr(emailer.smtplib, "SMTP", _flaky_smtp(connections, []))
+
+    with pytest.raises(SystemExit, match="max_messages_per_connection"):
+        emailer.send_email({"max_messages_per_connection": value}, "dest@example.com", "Subject", "Body")
+    assert connections == []
+
+
+def test_send_many_keeps_connection_after_rejected_recipients(monkeypatch):
+    connections = []
+    refusals = [
+        None,
+        emailer.smtplib.SMTPRecipientsRefused({"dest1@example.com": (550, b"No such user")}),
+        emailer.smtplib.SMTPDataError(554, b"Message rejected"),
+        None,
+    ]
+
+    class RejectingSMTP:
+        def __init__(self, *args, **kwargs):
+            self.sent = []
+            connections.append(self)
+
+        def starttls(self, *args, **kwargs):
+            return None
+
+        def login(self, *args, **kwargs):
+            return None
+
+        def noop(self):
+            return (250, b"OK")
+
+        def send_message(self, message):
+            error = refusals.pop(0)
+            if error is not None:
+                raise error
+            self.sent.append(message["To"])
+
+        def quit(self):
+            return None
+
+    monkeypatch.setattr(emailer.smtplib, "SMTP", RejectingSMTP)
+
+    batch = [(f"dest{i}@example.com", "Subject", "Body") for i in range(4)]
+    failures = emailer.send_many({}, batch)
+
+    assert [message for message, _ in failures] == batch[1:3]
+    assert len(connections) == 1
+    assert connections[0].sent == ["dest0@example.com", "dest3@example.com"]
+
+
+def test_send_many_aborts_batch_once_a_third_fails(monkeypatch):
+    attempts = []
+
+    class RejectingSMTP:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def starttls(self, *args, **kwargs):
+            return None
+
+        def login(self, *args, **kwargs):
+            return None
+
+        def send_message(self, message):
+            attempts.append(message["To"])
+            raise RuntimeError("rejected")
+
+        def quit(self):
+            return None
+
+    monkeypatch.setattr(emailer.smtplib, "SMTP", RejectingSMTP)
+
+    small_batch = [(f"dest{i}@example.com", "Subject", "Body") for i in range(3)]
+    failures = emailer.send_many({}, small_batch)
+    assert [message for message, _ in failures] == small_batch
+
+    attempts.clear()
+    batch = [(f"dest{i}@example.com", "Subject", "Body") for i in range(30)]
+    with pytest.raises(emailer.EmailBatchError) as excinfo:
+        emailer.send_many({}, batch)
+    assert len(attempts) == 10
+    assert excinfo.value.total == 30
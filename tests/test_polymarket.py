@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import concurrent.futures
+import threading
 import time
 from datetime import datetime, timezone
 
@@ -47,6 +49,15 @@ def test_format_trades_for_email_orders_entries_desc():
     assert "tx=0xnew" in body
 
 
+def test_format_trades_for_email_computes_shares_from_raw_values():
+    trade = {"timestamp": 1_700_000_000, "side": "BUY", "outcome": "YES", "title": "Big market"}
+    body = format_trades_for_email({"0xabc": [{**trade, "size": 2500.0, "price": 0.5}]})
+    assert "Parts: 5,000" in body
+
+    body = format_trades_for_email({"0xabc": [{**trade, "size": 2500.0, "price": 0}]})
+    assert "Parts: N/A" in body
+
+
 def test_fetch_trades_filters_by_since_epoch(monkeypatch):
     now = int(time.time())
     entries = [
@@ -71,15 +82,19 @@ def test_fetch_trades_filters_by_since_epoch(monkeypatch):
 
 
 def test_fetch_trades_falls_back_to_activity_on_server_error(monkeypatch):
+    attempts = 2
+    monkeypatch.setenv("POLYMARKET_RETRY_ATTEMPTS", str(attempts))
+    monkeypatch.setenv("POLYMARKET_RETRY_DELAY_MS", "0")
     now = int(time.time())
-    responses = [
-        PolymarketServerError("500 error"),
+    responses = [PolymarketServerError("500 error")] * attempts + [
         {"activity": [{"timestamp": now, "side": "SELL", "amount": "30", "market": {"slug": "activity"}}]},
     ]
     called_endpoints = []
+    sent_params = []
 
     def fake_request(endpoint, params):
         called_endpoints.append(endpoint)
+        sent_params.append(dict(params))
         response = responses.pop(0)
         if isinstance(response, Exception):
             raise response
@@ -90,4 +105,303 @@ def test_fetch_trades_falls_back_to_activity_on_server_error(monkeypatch):
     trades = fetch_trades("0x123", since_epoch=now - 60)
     assert len(trades) == 1
     assert trades[0]["marketSlug"] == "activity"
+    assert called_endpoints == [polymarket.TRADES_ENDPOINT] * attempts + [polymarket.ACTIVITY_ENDPOINT]
+    # /activity filters by time server-side; /trades does not accept start.
+    assert all("start" not in params for params in sent_params[:attempts])
+    assert sent_params[-1]["start"] == now - 60
+
+
+def test_fetch_trades_rejects_negative_retry_delay(monkeypatch):
+    monkeypatch.setenv("POLYMARKET_RETRY_DELAY_MS", "-5")
+    monkeypatch.setattr(polymarket, "_request_json", lambda endpoint, params: {"trades": []})
+
+    with pytest.raises(polymarket.PolymarketError, match="POLYMARKET_RETRY_DELAY_MS"):
+        fetch_trades("0x123", since_epoch=int(time.time()) - 60)
+
+
+def test_coerce_timestamp_treats_bool_as_number():
+    assert polymarket._coerce_timestamp({"timestamp": True}) == 1
+    assert type(polymarket._coerce_timestamp({"timestamp": True})) is int
+    assert polymarket._coerce_timestamp({"timestamp": 1_700_000_000_000}) == 1_700_000_000
+
+
+def test_dedupe_trades_drops_repeats_and_bounds_memory():
+    seen = polymarket._LRUSet(2)
+    trade_a = {"address": "0xabc", "txHash": "0xa", "timestamp": 1, "size": 5.0}
+    trade_b = {"address": "0xabc", "txHash": "0xb", "timestamp": 2, "size": 5.0}
+    trade_c = {"address": "0xabc", "txHash": "0xc", "timestamp": 3, "size": 5.0}
+
+    assert polymarket.dedupe_trades([trade_a, dict(trade_a), trade_b], seen) == [trade_a, trade_b]
+    assert polymarket.dedupe_trades([trade_b, trade_c], seen) == [trade_c]
+    assert len(seen) == 2
+    # trade_a was evicted when trade_c arrived, so it is reported again.
+    assert polymarket.dedupe_trades([trade_a], seen) == [trade_a]
+
+
+def test_fetch_trades_applies_size_and_side_filters_before_normalizing(monkeypatch):
+    now = int(time.time())
+    entries = [
+        {"timestamp": now - 10, "side": "buy", "size": "250", "price": "0.5", "market": {"slug": "big-buy"}},
+        {"timestamp": now - 20, "side": "BUY", "size": "5", "price": "0.5", "market": {"slug": "small-buy"}},
+        {"timestamp": now - 30, "side": "SELL", "amount": "900", "price": "0.5", "market": {"slug": "big-sell"}},
+    ]
+    monkeypatch.setattr(polymarket, "_request_json", lambda endpoint, params: {"trades": entries})
+
+    normalized = []
+    original_normalize = polymarket._normalize_trade
+
+    def tracking_normalize(trade, address, timestamp):
+        normalized.append(trade)
+        return original_normalize(trade, address, timestamp)
+
+    monkeypatch.setattr(polymarket, "_normalize_trade", tracking_normalize)
+
+    result = fetch_trades("0xabc", since_epoch=now - 60, min_size=100.0, sides=frozenset({"BUY"}))
+    assert [trade["marketSlug"] for trade in result] == ["big-buy"]
+    assert normalized == [entries[0]]
+
+
+def test_fetch_trades_hedges_slow_trades_call_with_activity(monkeypatch):
+    now = int(time.time())
+    monkeypatch.setattr(polymarket, "HEDGE_DELAY_MS", 10)
+    activity_called = threading.Event()
+    called_endpoints = []
+
+    def fake_request(endpoint, params):
+        called_endpoints.append(endpoint)
+        if endpoint == polymarket.TRADES_ENDPOINT:
+            # Stay slower than the hedge threshold until /activity has answered.
+            activity_called.wait(timeout=2)
+            time.sleep(0.05)
+            return {"trades": [{"timestamp": now, "side": "BUY", "size": "1", "market": {"slug": "trades"}}]}
+        activity_called.set()
+        return {"activity": [{"timestamp": now, "side": "SELL", "amount": "30", "market": {"slug": "activity"}}]}
+
+    monkeypatch.setattr(polymarket, "_request_json", fake_request)
+
+    futures = []
+    start_hedge_request = polymarket._start_hedge_request
+
+    def recording_start(*args):
+        future = start_hedge_request(*args)
+        futures.append(future)
+        return future
+
+    monkeypatch.setattr(polymarket, "_start_hedge_request", recording_start)
+
+    trades = fetch_trades("0x123", since_epoch=now - 60, hedge=True)
+    assert [trade["marketSlug"] for trade in trades] == ["activity"]
+
+    # Let the losing /trades request finish: it must not populate the cache.
+    concurrent.futures.wait(futures, timeout=2)
+    assert all(future.done() for future in futures)
+    assert sorted(called_endpoints) == sorted([polymarket.TRADES_ENDPOINT, polymarket.ACTIVITY_ENDPOINT])
+    assert [key[0] for key in polymarket._RESPONSE_CACHE] == [polymarket.ACTIVITY_ENDPOINT]
+
+
+def test_fetch_trades_hedge_does_not_fail_over_on_client_errors(monkeypatch):
+    called_endpoints = []
+
+    def fake_request(endpoint, params):
+        called_endpoints.append(endpoint)
+        if endpoint == polymarket.TRADES_ENDPOINT:
+            raise polymarket.PolymarketError("Invalid JSON from /trades")
+        return {"activity": []}
+
+    monkeypatch.setattr(polymarket, "_request_json", fake_request)
+
+    with pytest.raises(polymarket.PolymarketError, match="Invalid JSON"):
+        fetch_trades("0x123", since_epoch=int(time.time()) - 60, hedge=True)
+    assert called_endpoints == [polymarket.TRADES_ENDPOINT]
+
+
+def test_fetch_trades_reuses_the_shared_http_session(monkeypatch):
+    sessions = []
+
+    class FakeResponse:
+        status_code = 200
+        content = b'{"trades": []}'
+        headers = {}
+
+    def fake_get(self, url, **kwargs):
+        sessions.append(self)
+        assert kwargs["timeout"] == (polymarket.HTTP_CONNECT_TIMEOUT, polymarket.HTTP_TIMEOUT)
+        return FakeResponse()
+
+    monkeypatch.setattr(polymarket.requests.Session, "get", fake_get)
+
+    fetch_trades("0xaaa", since_epoch=0)
+    fetch_trades("0xbbb", since_epoch=0)
+    assert len(sessions) == 2
+    assert all(session is polymarket._SESSION for session in sessions)
+
+
+def test_fetch_trades_coalesces_identical_requests(monkeypatch):
+    now = int(time.time())
+    called_endpoints = []
+
+    def fake_request(endpoint, params):
+        called_endpoints.append(endpoint)
+        return {"trades": [{"timestamp": now - 30, "side": "BUY", "size": "5", "market": {"slug": "cached"}}]}
+
+    monkeypatch.setattr(polymarket, "_request_json", fake_request)
+
+    first = fetch_trades("0xabc", since_epoch=now - 60)
+    second = fetch_trades("0xabc", since_epoch=now - 60)
+    assert first == second
+    assert called_endpoints == [polymarket.TRADES_ENDPOINT]
+
+
+def test_fetch_trades_skips_request_for_future_window(monkeypatch):
+    def failing_request(endpoint, params):
+        raise AssertionError("no request expected for a window starting in the future")
+
+    monkeypatch.setattr(polymarket, "_request_json", failing_request)
+
+    assert fetch_trades("0xabc", since_epoch=int(time.time()) + 1000) == []
+
+
+def test_fetch_trades_many_dispatches_addresses_concurrently(monkeypatch):
+    addresses = ["0x1", "0x2", "0x3"]
+    barrier = threading.Barrier(len(addresses), timeout=2)
+
+    def slow_fetch(address, since_epoch, min_size=None, sides=None, hedge=False):
+        # Only returns if every address is in flight at the same time.
+        barrier.wait()
+        if address == "0x2":
+            raise PolymarketServerError("boom")
+        return [{"address": address}]
+
+    monkeypatch.setattr(polymarket, "fetch_trades", slow_fetch)
+
+    results = polymarket.fetch_trades_many(addresses, since_epoch=0, return_exceptions=True)
+    assert list(results) == addresses
+    assert results["0x1"] == [{"address": "0x1"}]
+    assert isinstance(results["0x2"], PolymarketServerError)
+    assert results["0x3"] == [{"address": "0x3"}]
+
+
+def test_fetch_trades_checks_activity_on_empty_trades_page_when_enabled(monkeypatch):
+    monkeypatch.setenv("POLYMARKET_EMPTY_FALLBACK", "1")
+    now = int(time.time())
+    called_endpoints = []
+
+    def fake_request(endpoint, params):
+        called_endpoints.append(endpoint)
+        if endpoint == polymarket.TRADES_ENDPOINT:
+            return {"trades": []}
+        return {"activity": [{"timestamp": now - 60, "side": "BUY", "size": "3", "market": {"slug": "activity"}}]}
+
+    monkeypatch.setattr(polymarket, "_request_json", fake_request)
+
+    trades = fetch_trades("0xabc", since_epoch=now - 2 * polymarket.SOFT_FALLBACK_WINDOW_SECONDS)
+    assert [trade["marketSlug"] for trade in trades] == ["activity"]
     assert called_endpoints == [polymarket.TRADES_ENDPOINT, polymarket.ACTIVITY_ENDPOINT]
+
+
+def test_fetch_trades_checks_activity_on_empty_trades_page_when_hedging(monkeypatch):
+    monkeypatch.setenv("POLYMARKET_EMPTY_FALLBACK", "1")
+    now = int(time.time())
+    called_endpoints = []
+
+    def fake_request(endpoint, params):
+        called_endpoints.append(endpoint)
+        if endpoint == polymarket.TRADES_ENDPOINT:
+            return {"trades": []}
+        return {"activity": [{"timestamp": now - 60, "side": "BUY", "size": "3", "market": {"slug": "activity"}}]}
+
+    monkeypatch.setattr(polymarket, "_request_json", fake_request)
+
+    since = now - 2 * polymarket.SOFT_FALLBACK_WINDOW_SECONDS
+    trades = fetch_trades("0xabc", since_epoch=since, hedge=True)
+    assert [trade["marketSlug"] for trade in trades] == ["activity"]
+    assert called_endpoints == [polymarket.TRADES_ENDPOINT, polymarket.ACTIVITY_ENDPOINT]
+
+
+def test_fetch_trades_replays_stored_page_on_not_modified(monkeypatch):
+    # Expire responses at once so every call reaches the (fake) HTTP session.
+    monkeypatch.setattr(polymarket, "RESPONSE_CACHE_TTL_SECONDS", 0)
+    now = int(time.time())
+    body = (
+        '{"trades": [{"timestamp": %d, "side": "BUY", "size": "3", "market": {"slug": "recent"}},'
+        ' {"timestamp": %d, "side": "BUY", "size": "3", "market": {"slug": "older"}}]}' % (now - 1800, now - 5400)
+    ).encode()
+    sent_headers = []
+
+    class FakeResponse:
+        def __init__(self, status_code, content=b"", headers=None):
+            self.status_code = status_code
+            self.content = content
+            self.headers = headers or {}
+
+    responses = [
+        FakeResponse(200, body, {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+        FakeResponse(304),
+    ]
+
+    def fake_get(self, url, params=None, headers=None, timeout=None):
+        sent_headers.append(headers)
+        return responses.pop(0)
+
+    monkeypatch.setattr(polymarket.requests.Session, "get", fake_get)
+
+    first = fetch_trades("0xabc", since_epoch=now - 3600)
+    assert [trade["marketSlug"] for trade in first] == ["recent"]
+    # A 304 means the page is unchanged, not that it is empty: the stored
+    # page is filtered again against the wider window.
+    second = fetch_trades("0xabc", since_epoch=now - 7200)
+    assert [trade["marketSlug"] for trade in second] == ["recent", "older"]
+    assert sent_headers == [
+        None,
+        {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"},
+    ]
+
+
+def test_request_json_stores_validators_only_for_ok_responses(monkeypatch):
+    class FakeResponse:
+        def __init__(self, status_code, content=b""):
+            self.status_code = status_code
+            self.content = content
+            self.headers = {"ETag": '"v1"'}
+
+        def raise_for_status(self):
+            return None
+
+    responses = [FakeResponse(503), FakeResponse(200, b'{"trades": []}')]
+    monkeypatch.setattr(polymarket.requests.Session, "get", lambda self, url, **kwargs: responses.pop(0))
+    params = {"user": "0xabc", "limit": polymarket.TRADE_LIMIT}
+
+    with pytest.raises(PolymarketServerError):
+        polymarket._request_json(polymarket.TRADES_ENDPOINT, params)
+    assert not polymarket._VALIDATOR_CACHE
+
+    assert polymarket._request_json(polymarket.TRADES_ENDPOINT, params) == {"trades": []}
+    assert list(polymarket._VALIDATOR_CACHE.values()) == [('"v1"', None, {"trades": []})]
+
+
+@pytest.mark.skipif(not hasattr(time, "tzset"), reason="requires time.tzset")
+def test_format_local_time_follows_dst_rules(monkeypatch):
+    monkeypatch.setenv("TZ", "Europe/Paris")
+    time.tzset()
+    polymarket._format_local_time.cache_clear()
+    try:
+        assert polymarket._format_local_time(1_704_067_200) == "01/01/2024 01:00:00"  # CET, UTC+1
+        assert polymarket._format_local_time(1_719_792_000) == "01/07/2024 02:00:00"  # CEST, UTC+2
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+        polymarket._format_local_time.cache_clear()
+
+
+def test_response_cache_drops_expired_entries_and_stays_bounded(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(polymarket.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(polymarket, "CACHE_MAX_ENTRIES", 2)
+
+    for since in (1, 2, 3):
+        polymarket._store_response(("/activity", (("start", since),)), {"activity": []})
+    assert [key[1] for key in polymarket._RESPONSE_CACHE] == [(("start", 2),), (("start", 3),)]
+
+    clock[0] += polymarket.RESPONSE_CACHE_TTL_SECONDS + 1
+    polymarket._store_response(("/activity", (("start", 4),)), {"activity": []})
+    assert [key[1] for key in polymarket._RESPONSE_CACHE] == [(("start", 4),)]